@@ -1,44 +1,433 @@
 from __future__ import annotations
 import os
+import re
+import sys
 from shutil import which
 import subprocess
-from json import dumps, loads
-from functools import wraps
+from copy import copy
+from functools import lru_cache, wraps
 from timeit import default_timer
 import logging
-from typing import Union, Any, List
+from tempfile import TemporaryFile
+from typing import IO, Any, Callable, Iterable, Iterator, Tuple, Union, List
+
+try:
+    # orjson is an optional, much faster drop in for parsing --json output
+    from orjson import loads, dumps as _dumps
+
+    def dumps(obj) -> str:
+        return _dumps(obj).decode("UTF-8")
+
+except ImportError:
+    from json import dumps as _dumps, loads
+
+    def dumps(obj) -> str:
+        # the same compact, unescaped output as orjson
+        return _dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+# ripgrep writes the "type" key first in every --json record
+_MATCH_PREFIX = b'{"type":"match"'
+_MATCH_TYPE = b'"type":"match"'
+
+
+def _iter_match_lines(lines: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Yields the match records out of ripgrep's --json output lines without
+    decoding the begin, end, context and summary records. The substring
+    check only runs when the prefix misses. Line endings are left alone,
+    a trailing \\r or \\n is JSON whitespace for loads
+    """
+    for line in lines:
+        if line.startswith(_MATCH_PREFIX) or _MATCH_TYPE in line:
+            yield line
+
+
+def _iter_matches(lines: Iterable[bytes]) -> Iterator[dict]:
+    """
+    Yields the decoded match records out of ripgrep's --json output lines
+    """
+    for line in _iter_match_lines(lines):
+        data = loads(line)
+        if data["type"] == "match":
+            yield data
+
+
+_log = logging.getLogger(__name__)
 
 
 def _logger(func):
     """
-    Logger decorator
+    Logger decorator for methods that only take self. Timing is skipped
+    unless debug logging is enabled
     """
 
     @wraps(func)
-    def l(*args, **kwargs):
-        try:
-            start = default_timer()
-            o = func(*args, **kwargs)
-            end = default_timer()
-            rt = str(round(end - start, 4)) + " seconds"
-            logging.debug(f"{func.__name__} runtime {rt}")
-            return o
-        except:
-            logging.exception("")
-            raise
+    def l(self):
+        if not _log.isEnabledFor(logging.DEBUG):
+            return func(self)
+        start = default_timer()
+        o = func(self)
+        end = default_timer()
+        _log.debug("%s runtime %.4f seconds", func.__name__, end - start)
+        return o
 
     return l
 
 
+def _which_rg(rg_path: str, path_env: Union[str, None]) -> Union[str, None]:
+    rg = which(rg_path, path=path_env)
+    # an absolute executable lets subprocess use posix_spawn instead of fork
+    # where the Python version allows it
+    return None if rg is None else os.path.abspath(rg)
+
+
+@lru_cache(maxsize=32)
+def _which_rg_cached(rg_path: str, path_env: Union[str, None]) -> str:
+    rg = _which_rg(rg_path, path_env)
+    if rg is None:
+        # exceptions are not cached, so ripgrep installed later is found
+        raise LookupError(rg_path)
+    return rg
+
+
+def _resolve_rg(rg_path: str, path_env: Union[str, None]) -> Union[str, None]:
+    """
+    which() for ripgrep. Lookups on $PATH are cached, keyed on the $PATH
+    they were resolved against. Paths with a directory part depend on the
+    working directory and are not cached, and neither are misses
+    """
+    if os.path.dirname(rg_path):
+        return _which_rg(rg_path, path_env)
+    try:
+        return _which_rg_cached(rg_path, path_env)
+    except LookupError:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _has_pcre2(rg: str) -> bool:
+    """
+    Whether this ripgrep was built with PCRE2, probed once per executable
+    """
+    probe = subprocess.run(
+        [rg, "--pcre2-version"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return probe.returncode == 0
+
+
+# Options of the builder methods that consume the following token
+_VALUE_FLAGS = frozenset(
+    (
+        "--after-context",
+        "--before-context",
+        "--context",
+        "--dfa-size-limit",
+        "--encoding",
+        "--engine",
+        "--file",
+        "--glob",
+        "--iglob",
+        "--ignore-file",
+        "--max-columns",
+        "--max-count",
+        "--max-depth",
+        "--max-filesize",
+        "--path-separator",
+        "--pre",
+        "--pre-glob",
+        "--regex-size-limit",
+        "--regexp",
+        "--replace",
+        "--sort",
+        "--sortr",
+        "--threads",
+        "--type",
+        "--type-add",
+        "--type-not",
+    )
+)
+
+# Options that decide which files are searched, or how their contents are
+# read, and so have to be repeated in the files-with-matches pass
+_PREFILTER_FLAGS = frozenset(
+    (
+        "--binary",
+        "--case-sensitive",
+        "--crlf",
+        "--encoding",
+        "--follow",
+        "--glob",
+        "--hidden",
+        "--iglob",
+        "--ignore-case",
+        "--ignore-file",
+        "--ignore-file-case-insensitive",
+        "--max-depth",
+        "--max-filesize",
+        "--no-config",
+        "--no-encoding",
+        "--no-ignore",
+        "--no-ignore-dot",
+        "--no-ignore-global",
+        "--no-ignore-parent",
+        "--no-ignore-vcs",
+        "--null-data",
+        "--one-file-system",
+        "--pre",
+        "--pre-glob",
+        "--search-zip",
+        "--text",
+        "--threads",
+        "--type",
+        "--type-add",
+        "--type-clear",
+        "--type-not",
+        "--unrestricted",
+    )
+)
+
+# Options whose output includes files that do not contain a match
+_NO_PREFILTER_FLAGS = frozenset(
+    ("--files", "--files-without-match", "--invert-match", "--passthru")
+)
+
+# Syntax only PCRE2 understands: look-around, atomic groups, backtracking
+# verbs, backreferences and other escapes, and possessive quantifiers.
+# \v is any vertical whitespace in PCRE2 but only VT in the default engine,
+# and \V, \e, \c, \o and \0 are PCRE2 only. It errs on the side of keeping
+# PCRE2
+_PCRE2_FEATURES = re.compile(
+    r"\(\?(?:[^:a-zA-Z]|R|P[>=])|\(\*|\\[0-9gkKGQEXRhHNCZvVeco]|[*+?}]\+"
+)
+
+# Options that supply patterns other than regex_pattern, or need none
+_PATTERN_FLAGS = frozenset(("--file", "--files", "--regexp"))
+
+# Globs of exclude_generated
+_GENERATED_GLOBS = (
+    "!*.lock",
+    "!package-lock.json",
+    "!*.min.js",
+    "!*.min.css",
+    "!*.map",
+    "!*.snap",
+)
+
+# Options that already decide whether paths are printed
+_FILENAME_FLAGS = frozenset(("--no-filename", "--with-filename"))
+
+# The second pass of two_pass passes the matching files as arguments. Above
+# this size, counting a pointer per argument, the command line could
+# exceed the OS limit and a single pass is used instead
+try:
+    _MAX_ARGV_BYTES = os.sysconf("SC_ARG_MAX") // 2
+except (AttributeError, ValueError, OSError):
+    _MAX_ARGV_BYTES = 16000
+
+# Options whose results depend on Unicode mode: case folding and word
+# boundaries follow it, and patterns read from a file are unknown
+_UNICODE_FLAGS = frozenset(("--file", "--ignore-case", "--smart-case", "--word-regexp"))
+
+
+def _flag(flag: str, once: bool = False):
+    """
+    Turns a method stub into a builder that appends flag to the command.
+    The stub only provides the name, signature and docstring. With once,
+    the flag is only appended if it is not in the command yet, which is
+    meant for flags that no other option overrides
+    """
+    # one shared str object per flag, so membership tests against the
+    # command can succeed on identity before comparing characters
+    flag = sys.intern(flag)
+
+    def decorator(func):
+        if once:
+
+            def method(self):
+                if flag not in self.command:
+                    self.command.append(flag)
+                return self
+
+        else:
+
+            def method(self):
+                self.command.append(flag)
+                return self
+
+        return wraps(func)(method)
+
+    return decorator
+
+
+def _spawn(
+    command: List[str],
+    stderr: IO[bytes],
+    stdin: Union[IO[bytes], None] = None,
+    env: Union[dict, None] = None,
+    stdout: int = subprocess.PIPE,
+) -> subprocess.Popen:
+    """
+    Starts ripgrep with its stdout on a pipe. stderr is a file so a chatty
+    ripgrep can never block on a full pipe while stdout is being streamed.
+    Without a pipe to read, stdin is /dev/null unless the command searches
+    -, so ripgrep never waits on or consumes the stdin of the host process.
+    Descriptors are closed in ripgrep as the host process may hold
+    inheritable ones it does not know about. Given the absolute rg path,
+    Python 3.13 can still use posix_spawn for this on platforms that
+    support closing descriptors from it. The 1 MiB read buffer cuts down
+    on read calls for large outputs.
+    """
+    if stdin is None and "-" not in command:
+        stdin = subprocess.DEVNULL
+    return subprocess.Popen(
+        command,
+        bufsize=1 << 20,
+        stdin=stdin,
+        stdout=stdout,
+        stderr=stderr,
+        env=env,
+        shell=False,
+    )
+
+
 class RipGrepNotFound(Exception):
     pass
 
 
+class RipGrepError(Exception):
+    pass
+
+
 class RipGrepOut(object):
-    def __init__(self, _output: Any, command: List[str]):
-        self._output = _output
+    __slots__ = (
+        "_process",
+        "_upstream",
+        "_stderr",
+        "_error",
+        "_lines",
+        "_parsed",
+        "_is_json",
+        "_keep_raw",
+        "command",
+    )
+
+    def __init__(
+        self,
+        process: Union[subprocess.Popen, None],
+        command: List[str],
+        stderr: Union[IO[bytes], None],
+        upstream: Union[subprocess.Popen, None] = None,
+        keep_raw: bool = False,
+    ):
+        self._process = process
+        self._upstream = upstream
+        self._stderr = stderr
+        self._error = b""
+        self._lines: Union[List[bytes], None] = None
+        self._parsed: Union[list, None] = None
+        self._is_json = "--json" in command
+        self._keep_raw = keep_raw
         self.command = command
 
+    def _stream(self, keep: bool = True) -> Iterator[bytes]:
+        """
+        Yields the stdout lines of ripgrep. The first pass reads them from
+        the pipe while ripgrep is still searching and, if keep is set, holds
+        on to them so later passes can replay them.
+        """
+        if self._lines is not None:
+            yield from self._lines
+            return
+        if self._parsed is not None:
+            raise TypeError(
+                "The raw output was released after parsing. "
+                "Use Ripgrepy(..., keep_raw=True) to read both"
+            )
+        lines = []
+        if keep:
+            self._lines = lines
+        if self._process is None or self._stderr.closed:
+            # nothing to read, or the output was discarded by close
+            return
+        for line in self._process.stdout or ():
+            if keep:
+                lines.append(line)
+            yield line
+        self._finish()
+
+    def _finish(self) -> None:
+        """
+        Reaps ripgrep and collects its stderr once stdout has been drained
+        """
+        if self._process.stdout is not None:
+            self._process.stdout.close()
+        self._process.wait()
+        if self._upstream is not None:
+            self._upstream.wait()
+        self._stderr.seek(0)
+        self._error = self._stderr.read()
+        self._stderr.close()
+
+    def close(self) -> None:
+        """
+        Stops ripgrep if it is still running and releases its pipe and
+        stderr file. Output that was not read yet is lost. It is called
+        when the object is garbage collected or used as a context manager,
+        and does nothing once the output has been read.
+
+        >>> with Ripgrepy("foo", "/some/path").run() as out:
+        >>>     first = out.as_string.partition("\n")[0]
+        """
+        if self._stderr is None or self._stderr.closed:
+            return
+        for process in (self._process, self._upstream):
+            if process is not None and process.poll() is None:
+                process.kill()
+        self._finish()
+
+    def __enter__(self) -> RipGrepOut:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    @property
+    def returncode(self) -> int:
+        """
+        The exit status of ripgrep, waiting for it to finish if needed. 0
+        means a match was found, 1 means none was and 2 means an error
+        occurred. Use it with quiet() to only check whether anything
+        matches. With pipe_to, an error in the upstream search is 2 as well.
+
+        :return: Exit status
+        :rtype: int
+        """
+        if self._process is None:
+            return 1
+        if not self._stderr.closed:
+            # repr may have polled the exit status before the output was read
+            for _ in self._stream():
+                pass
+        if self._upstream is not None and self._upstream.returncode == 2:
+            return 2
+        return self._process.returncode
+
+    @property
+    def _output(self) -> str:
+        if self._process is not None and self._stderr.closed and self.returncode:
+            return self._error.decode("UTF-8")
+        for _ in self._stream():
+            pass
+        if self.returncode == 0:
+            return b"".join(self._lines).decode("UTF-8")
+        return self._error.decode("UTF-8")
+
     @property
     @_logger
     def as_dict(self) -> list:
@@ -49,6 +438,8 @@ class RipGrepOut(object):
 
         :return: Array of matched objects
         :rtype: list
+        :raises RipGrepError: If ripgrep failed without finding any match,
+                with ripgrep's error message
 
         The following is an example of the dict output.
 
@@ -59,15 +450,16 @@ class RipGrepOut(object):
         >>>   'submatches': [{'end': 4, 'match': {'text': 'test'}, 'start': 0}]},
         >>> 'type': 'match'}]
         """
-        if "--json" not in self.command:
+        if not self._is_json:
             raise TypeError("To use as_dict, use the json() method")
-        out = self._output.splitlines()
-        holder = []
-        for line in out:
-            data = loads(line)
-            if data["type"] == "match":
-                holder.append(data)
-        return holder
+        if self._parsed is None:
+            self._parsed = list(_iter_matches(self._stream(self._keep_raw)))
+            if not self._keep_raw:
+                # only one copy of a large result is held from here on
+                self._lines = None
+        if not self._parsed and self.returncode == 2:
+            raise RipGrepError(self._error.decode("UTF-8", "replace").strip())
+        return self._parsed
 
     @property
     @_logger
@@ -78,19 +470,13 @@ class RipGrepOut(object):
 
         :return: JSON object
         :rtype: str
+        :raises RipGrepError: If ripgrep failed without finding any match
         """
-        if "--json" not in self.command:
+        if not self._is_json:
             raise TypeError("To use as_json, use the json() method")
-        out = self._output.splitlines()
-        holder = []
-        for line in out:
-            data = loads(line)
-            if data["type"] == "match":
-                holder.append(data)
-        return dumps(holder)
+        return dumps(self.as_dict)
 
     @property
-    @_logger
     def as_string(self) -> str:
         """
         Returns stdout from ripgrep
@@ -100,8 +486,30 @@ class RipGrepOut(object):
         """
         return self._output
 
+    def __str__(self):
+        if self._lines is None and self._parsed is not None:
+            # the raw output was released after parsing
+            return repr(self)
+        return self._output
+
     def __repr__(self):
-        return str(self._output)
+        # debuggers call this implicitly, so it neither reads the output
+        # nor waits for ripgrep and only shows what is known already
+        if self._process is None:
+            status = "returncode=1"
+        else:
+            returncode = self._process.poll()
+            status = "running" if returncode is None else f"returncode={returncode}"
+        if self._parsed is not None:
+            summary = f"matches={len(self._parsed)}"
+        elif self._lines is not None:
+            size = sum(map(len, self._lines))
+            summary = f"lines={len(self._lines)} bytes={size}"
+        elif self._process is None:
+            summary = "lines=0 bytes=0"
+        else:
+            summary = "unread"
+        return f"<RipGrepOut {status} {summary} command={self.command!r}>"
 
 
 class Ripgrepy(object):
@@ -112,114 +520,400 @@ class Ripgrepy(object):
     :type regex_pattern: str
     :param path: A file or directory to search. Directories are searched
            recursively. Paths specified explicitly on the command line
-           override glob and ignore rules
-    :type path: str
+           override glob and ignore rules. A list of paths is searched
+           by a single ripgrep process
+    :type path: str or list
     :param rg_path: Path to ripgrep. Defaults to $PATH
     :type rg_path: str
+    :param threads: Number of threads ripgrep should search with. Defaults
+           to letting ripgrep choose
+    :type threads: int
+    :param keep_raw: Keep the raw output after as_dict or as_json parsed it,
+           so that as_string can still be read. Defaults to False which
+           frees it to halve the memory held for large results
+    :type keep_raw: bool
+    :param default_max_filesize: Skip files larger than this, e.g. 1M, to
+           bound the time spent on huge generated files. A later
+           max_filesize call overrides it. Defaults to no limit
+    :type default_max_filesize: str
     :raises RipGrepNotFound: Error if path to ripgrep could not be resolved
     """
 
-    def __init__(self, regex_pattern: str, path: str, rg_path: str = "rg"):
+    __slots__ = (
+        "regex_pattern",
+        "path",
+        "_rg_path",
+        "_literal_hint",
+        "_pipe_source",
+        "_keep_raw",
+        "_c_locale",
+        "_mode",
+        "command",
+    )
+
+    #: A sensible thread count for the threads argument
+    DEFAULT_THREADS = min(os.cpu_count() or 1, 8)
+    #: The --max-filesize added by multiline when none was chained
+    MULTILINE_MAX_FILESIZE = "1G"
+
+    def __init__(
+        self,
+        regex_pattern: str,
+        path: Union[str, List[str]],
+        rg_path: str = "rg",
+        threads: Union[int, None] = None,
+        keep_raw: bool = False,
+        default_max_filesize: Union[str, None] = None,
+    ):
         self.regex_pattern = regex_pattern
-        self.path = os.path.expanduser(path)
-        self._output: Union[str, None] = None
+        if isinstance(path, str):
+            self.path = os.path.expanduser(path)
+        else:
+            self.path = [os.path.expanduser(p) for p in path]
         self._rg_path = rg_path
+        self._literal_hint: Union[str, None] = None
+        self._pipe_source: Union[Ripgrepy, None] = None
+        self._keep_raw = keep_raw
+        self._c_locale = False
+        self._mode: Union[str, None] = None
+
+        rg = _resolve_rg(self._rg_path, os.environ.get("PATH"))
+        if rg is None:
+            raise RipGrepNotFound("ripgrep not found")
         #: The ripgreg command that will be executed
-        self.command: List[str] = [self._rg_path]
+        self.command: List[str] = [rg]
+        if threads is not None:
+            self.command.extend(("--threads", str(threads)))
+        if default_max_filesize is not None:
+            self.command.extend(("--max-filesize", default_max_filesize))
 
-        if which(self._rg_path) is None:
-            raise RipGrepNotFound("ripgrep not found")
+    @classmethod
+    def from_paths(
+        cls, regex_pattern: str, paths: List[str], **kwargs: Any
+    ) -> Ripgrepy:
+        """
+        Search several files or directories with one ripgrep process.
+        This is much faster than creating a Ripgrepy per file as ripgrep
+        can then spread the files over its own thread pool.
 
-        # short syntax mapping
-        #: Short syntax for byte_offset
-        self.b = self.byte_offset
-        #: Short syntax for case_sensitive
-        self.s = self.case_sensitive
-        #: Short syntax for encoding
-        self.E = self.encoding
-        #: Short syntax for file
-        self.f = self.file
-        #: Short syntax for files_with_matches
-        self.l = self.files_with_matches
-        #: Short syntax for fixed_strings
-        self.F = self.fixed_strings
-        #: Short syntax for follow
-        self.L = self.follow
-        #: Short syntax for glob
-        self.g = self.glob
-        #: Short syntax for ignore_case
-        self.i = self.ignore_case
-        #: Short syntax for invert_match
-        self.v = self.invert_match
-        #: Short syntax for line_number
-        self.n = self.line_number
-        #: Short syntax for after_context
-        self.A = self.after_context
-        #: Short syntax for before_context
-        self.B = self.before_context
-        #: Short syntax for context
-        self.C = self.context
-        #: Short syntax for line_regexp
-        self.x = self.line_regexp
-        #: Short syntax for max_columns
-        self.M = self.max_columns
-        #: Short syntax for max_count
-        self.m = self.max_count
-        #: Short syntax for multiline
-        self.U = self.multiline
-        #: Short syntax for no_filename
-        self.I = self.no_filename
-        #: Short syntax for no_line_number
-        self.N = self.no_line_number
-        #: Short syntax for only_matching
-        self.o = self.only_matching
-        #: Short syntax for pcre2
-        self.P = self.pcre2
-        #: Short syntax for pretty
-        self.p = self.pretty
-        #: Short syntax for quiet
-        self.q = self.quiet
-        #: Short syntax for regexp
-        self.e = self.regexp
-        #: Short syntax for replace
-        self.r = self.replace
-        #: Short syntax for search_zip
-        self.z = self.search_zip
-        #: Short syntax for smart_case
-        self.S = self.smart_case
-        #: Short syntax for text
-        self.a = self.text
-        #: Short syntax for threads
-        self.j = self.threads
-        #: Short syntax for type_not
-        self.T = self.type_not
-        #: Short syntax for unrestricted
-        self.u = self.unrestricted
-        #: Short syntax for with_filename
-        self.H = self.with_filename
-        #: Short syntax for word_regexp
-        self.w = self.word_regexp
-        #: Alias to run
-        self.run_rg = self.run
+        :param regex_pattern: A regular expression used for searching
+        :type regex_pattern: str
+        :param paths: Files or directories to search
+        :type paths: list
+        :return: Ripgrepy instance searching all paths
+        :rtype: Ripgrepy
+        """
+        return cls(regex_pattern, list(paths), **kwargs)
 
     @_logger
     def run(self) -> RipGrepOut:
         """
         Returns an instace of the Ripgrepy object
 
+        An empty pattern with no regexp or file patterns would match every
+        line of every file, so ripgrep is not started and the output is
+        empty.
+
         :return: self
         :rtype: RipGrepOut
         """
-        self.command.append(self.regex_pattern)
-        self.command.append(self.path)
-        output = subprocess.run(self.command, capture_output=True)
-        if output.returncode == 0:
-            self._output = output.stdout.decode("UTF-8")
-        else:
-            self._output = output.stderr.decode("UTF-8")
-        return RipGrepOut(self._output, self.command)
+        if not self._complete_command():
+            return RipGrepOut(None, self.command, None, keep_raw=self._keep_raw)
+        source = None
+        if self._pipe_source is not None:
+            # a copy, so the upstream search is completed like run would
+            # without changing the Ripgrepy that was passed to pipe_to
+            source = self._pipe_source.with_pattern(self._pipe_source.regex_pattern)
+            if not source._complete_command():
+                return RipGrepOut(None, self.command, None, keep_raw=self._keep_raw)
+        stderr = TemporaryFile()
+        stdin = upstream = None
+        if source is not None:
+            upstream = _spawn(source.command, stderr, env=source._child_env())
+            stdin = upstream.stdout
+        # quiet searches print nothing, so there is no output to read
+        stdout = subprocess.DEVNULL if "--quiet" in self.command else subprocess.PIPE
+        process = _spawn(self.command, stderr, stdin, self._child_env(), stdout)
+        if stdin is not None:
+            # the downstream ripgrep now owns the read end of the pipe
+            stdin.close()
+        return RipGrepOut(process, self.command, stderr, upstream, self._keep_raw)
+
+    def _complete_command(self) -> bool:
+        """
+        Appends the pattern and the paths to search to the command. Returns
+        False when the output is known to be empty without running ripgrep
+        """
+        # listing modes such as --type-list take neither pattern nor paths
+        if self._mode is not None:
+            return True
+        paths = self._search_paths()
+        if not self.regex_pattern and _PATTERN_FLAGS.isdisjoint(self.command):
+            self.command.append(self.regex_pattern)
+            return False
+        if self._pipe_source is not None:
+            # search the output of the upstream ripgrep on stdin
+            paths = ["-"]
+        elif self._literal_hint is not None and _NO_PREFILTER_FLAGS.isdisjoint(
+            self.command
+        ):
+            files = self._files_with_literal(paths)
+            if files is None:
+                _log.debug("the first pass failed, searching once")
+            elif not files:
+                self.command.append(self.regex_pattern)
+                return False
+            elif sum(len(os.fsencode(f)) + 9 for f in files) > _MAX_ARGV_BYTES:
+                _log.debug("too many files for two passes, searching once")
+            else:
+                # ripgrep hides the path when given a single file, keep
+                # the output the same as a single pass would give
+                one_file = len(paths) == 1 and os.path.isfile(paths[0])
+                if not one_file and _FILENAME_FLAGS.isdisjoint(self.command):
+                    self.command.append("--with-filename")
+                paths = files
+        if self.regex_pattern:
+            self.command.append(self.regex_pattern)
+        # otherwise the patterns come from regexp or file, and ripgrep would
+        # read an empty one as a path
+        self.command.extend(paths)
+        return True
+
+    def run_stream(self) -> Iterator[Union[str, dict]]:
+        """
+        Runs ripgrep and yields its output while it is still searching,
+        without holding on to it. With json() each match object is yielded
+        as it would appear in as_dict, otherwise each line of stdout is
+        yielded as a string. Closing the generator early stops ripgrep.
+
+        >>> for match in Ripgrepy("foo", "/some/path").json().run_stream():
+        >>>     print(match["data"]["path"]["text"])
+
+        :return: A generator of output lines or match objects
+        :rtype: Iterator
+        :raises RipGrepError: If ripgrep failed without yielding anything,
+                with ripgrep's error message
+        """
+        out = self.run()
+        lines = out._stream(keep=False)
+        found = False
+        try:
+            if out._is_json:
+                for match in _iter_matches(lines):
+                    found = True
+                    yield match
+            else:
+                for line in lines:
+                    found = True
+                    yield line.decode("UTF-8")
+            if not found and out.returncode == 2:
+                raise RipGrepError(out._error.decode("UTF-8", "replace").strip())
+        finally:
+            out.close()
+
+    def freeze(self) -> Tuple[str, ...]:
+        """
+        Returns the command chained so far together with the pattern, but
+        without the paths, for searching many paths with run_many. Only
+        the command is kept, so c_locale, two_pass and pipe_to do not
+        carry over.
+
+        >>> frozen = Ripgrepy("foo", "").json().ignore_case().freeze()
+        >>> for out in run_many(frozen, repos):
+        >>>     print(out.as_dict)
+
+        :return: The ripgrep argv without paths
+        :rtype: tuple
+        :raises ValueError: If the pattern is empty and neither regexp nor
+                file was used, as the first path would be read as the pattern
+        """
+        if not self.regex_pattern:
+            if _PATTERN_FLAGS.isdisjoint(self.command):
+                raise ValueError("freeze needs a pattern, regexp or file")
+            # the patterns come from regexp or file
+            return tuple(self.command)
+        # --regexp keeps patterns that start with a dash from being read
+        # as flags
+        return (*self.command, "--regexp", self.regex_pattern)
+
+    def prepare(self) -> Callable[[str], RipGrepOut]:
+        """
+        Freezes the options chained so far and returns a function that
+        searches the paths for a given pattern. Unlike with_pattern, no
+        Ripgrepy is created per search, which suits many short searches
+        with the same options such as a search box.
+
+        >>> search = Ripgrepy("", "/some/path").json().smart_case().prepare()
+        >>> search("foo").as_dict
+
+        As with run, an empty pattern is not searched unless regexp or file
+        supply patterns.
+
+        :return: A function that takes a pattern and returns its RipGrepOut
+        :rtype: Callable
+        """
+        prefix = tuple(self.command)
+        paths = tuple(self._search_paths())
+        keep_raw = self._keep_raw
+        env = self._child_env()
+
+        def search(regex_pattern: str) -> RipGrepOut:
+            if regex_pattern:
+                # --regexp keeps patterns that start with a dash from being
+                # read as flags
+                command = [*prefix, "--regexp", regex_pattern, *paths]
+            else:
+                command = [*prefix, *paths]
+                if _PATTERN_FLAGS.isdisjoint(prefix):
+                    return RipGrepOut(None, command, None, keep_raw=keep_raw)
+            stderr = TemporaryFile()
+            return RipGrepOut(
+                _spawn(command, stderr, env=env), command, stderr, keep_raw=keep_raw
+            )
+
+        return search
+
+    def with_pattern(self, regex_pattern: str) -> Ripgrepy:
+        """
+        Returns a copy of this search with a different pattern. The copy
+        keeps the options chained so far, the paths and the already resolved
+        ripgrep, so running the same options for many patterns does not
+        repeat that work. Call this on a Ripgrepy that has not been run.
+
+        >>> base = Ripgrepy("", "/some/path").json().ignore_case()
+        >>> results = [base.with_pattern(p).run().as_dict for p in patterns]
+
+        :param regex_pattern: A regular expression used for searching
+        :type regex_pattern: str
+        :return: A new Ripgrepy instance
+        :rtype: Ripgrepy
+        """
+        new = copy(self)
+        new.regex_pattern = regex_pattern
+        new.command = list(self.command)
+        return new
+
+    def _search_paths(self) -> List[str]:
+        return [self.path] if isinstance(self.path, str) else self.path
+
+    def _cap_filesize(self) -> None:
+        # multiline searches read whole files into memory
+        if "--max-filesize" not in self.command:
+            _log.info(
+                "capping multiline search at --max-filesize %s",
+                self.MULTILINE_MAX_FILESIZE,
+            )
+            self.command.extend(("--max-filesize", self.MULTILINE_MAX_FILESIZE))
+
+    def _child_env(self) -> Union[dict, None]:
+        if not self._c_locale:
+            return None
+        return {**os.environ, "LC_ALL": "C"}
+
+    def _require_pcre2(self) -> None:
+        if not _has_pcre2(self.command[0]):
+            raise RuntimeError("ripgrep was built without PCRE2")
+
+    def _patterns(self) -> List[str]:
+        patterns = [self.regex_pattern]
+        patterns.extend(
+            value
+            for flag, value in zip(self.command, self.command[1:])
+            if flag == "--regexp"
+        )
+        return patterns
+
+    def c_locale(self) -> Ripgrepy:
+        """
+        Run ripgrep with LC_ALL=C in its environment. ripgrep itself does
+        not look at the locale, but preprocessors started with pre() do, and
+        tools like grep, sed or sort are much faster in the C locale. Do not
+        use it when the preprocessor has to handle non ASCII text.
+
+        :return: self
+        :rtype: Ripgrepy
+        """
+        self._c_locale = True
+        return self
+
+    def pipe_to(self, other: Ripgrepy) -> Ripgrepy:
+        """
+        Feed the output of this search into another ripgrep search. Both
+        ripgrep processes run at the same time and are connected with an OS
+        pipe, so the intermediate output never passes through Python. The
+        path of other is ignored as it searches stdin instead. This search
+        is run the way run would run it, including two_pass.
+
+        >>> Ripgrepy("error", "/var/log").no_filename().pipe_to(
+        >>>     Ripgrepy("timeout", "-")
+        >>> ).run().as_string
+
+        :param other: The search that receives this output
+        :type other: Ripgrepy
+        :return: other, so that chaining and run continue on it
+        :rtype: Ripgrepy
+        :raises ValueError: If this search already reads from a pipe_to
+        """
+        if self._pipe_source is not None:
+            raise ValueError("Only one pipe_to per chain of searches is supported")
+        other._pipe_source = self
+        return other
+
+    def _files_with_literal(self, paths: List[str]) -> Union[List[str], None]:
+        """
+        First pass of two_pass. Lists the files under paths that contain the
+        literal hint, honouring the file selection options of the command.
+        Returns None if ripgrep failed without listing any file, so that
+        the single pass reports the error
+        """
+        command = [self.command[0], "--files-with-matches", "--null"]
+        tokens = iter(self.command[1:])
+        for token in tokens:
+            value = next(tokens) if token in _VALUE_FLAGS else None
+            if token not in _PREFILTER_FLAGS:
+                continue
+            command.append(token)
+            if value is not None:
+                command.append(value)
+        if "--smart-case" in self.command:
+            # the hint may differ in case from the full pattern
+            command.append("--ignore-case")
+        command.extend(("--fixed-strings", "--regexp", self._literal_hint, *paths))
+        output = subprocess.run(
+            command,
+            stdin=None if "-" in paths else subprocess.DEVNULL,
+            capture_output=True,
+            env=self._child_env(),
+            shell=False,
+        )
+        files = [os.fsdecode(f) for f in output.stdout.split(b"\0") if f]
+        if not files and output.returncode == 2:
+            return None
+        return files
+
+    def two_pass(self, literal_hint: str) -> Ripgrepy:
+        """
+        Search in two passes. The first pass cheaply lists the files that
+        contain literal_hint as a fixed string, the second runs the full
+        pattern over those files only. This pays off on large trees with
+        few matching files and an expensive pattern, such as with pcre2,
+        multiline or many regexps.
+
+        literal_hint must be a substring of every possible match, otherwise
+        files will be missed. File selection options like glob, type and
+        hidden are applied to the first pass. Two passes are not used with
+        invert_match, files_without_match, passthru or files, and a single
+        pass is used when the matching files would not fit on a command
+        line.
+
+        :param literal_hint: A fixed string that every match contains
+        :type literal_hint: str
+        :return: self
+        :rtype: Ripgrepy
+        """
+        self._literal_hint = literal_hint
+        return self
 
-    @_logger
     def after_context(self, number: int) -> Ripgrepy:
         """
         Show NUM lines after each match.
@@ -231,11 +925,9 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--after-context")
-        self.command.append(str(number))
+        self.command.extend(("--after-context", str(number)))
         return self
 
-    @_logger
     def before_context(self, number: int) -> Ripgrepy:
         """
         Show NUM lines before each match.
@@ -247,11 +939,9 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--before-context")
-        self.command.append(str(number))
+        self.command.extend(("--before-context", str(number)))
         return self
 
-    @_logger
     def context(self, number: int) -> Ripgrepy:
         """
         Show NUM lines before and after each match. This is equivalent to
@@ -267,11 +957,10 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--context")
-        self.command.append(str(number))
+        self.command.extend(("--context", str(number)))
         return self
 
-    @_logger
+    @_flag("--binary")
     def binary(self) -> Ripgrepy:
         """
         Enabling this flag will cause ripgrep to search binary files. By
@@ -308,10 +997,8 @@ class Ripgrepy(object):
         This flag can be disabled with --no-binary. It overrides the
         -a/--text flag.
         """
-        self.command.append("--binary")
-        return self
 
-    @_logger
+    @_flag("--auto-hybrid-regex")
     def auto_hybrid_regex(self) -> Ripgrepy:
         """
         When this flag is used, ripgrep will dynamically choose between
@@ -346,10 +1033,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--auto-hybrid-regex")
-        return self
 
-    @_logger
+    @_flag("--block-buffered")
     def block_buffered(self) -> Ripgrepy:
         """
         When enabled, ripgrep will use block buffering. That is, whenever a
@@ -369,10 +1054,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--block-buffered")
-        return self
 
-    @_logger
+    @_flag("--byte-offset")
     def byte_offset(self) -> Ripgrepy:
         """
         Print the 0-based byte offset within the input file before each
@@ -388,10 +1071,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--byte-offset")
-        return self
 
-    @_logger
+    @_flag("--case-sensitive")
     def case_sensitive(self) -> Ripgrepy:
         """
         Search case sensitively.
@@ -401,10 +1082,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--case-sensitive")
-        return self
 
-    @_logger
+    @_flag("--count-matches")
     def count_matches(self) -> Ripgrepy:
         """
         This flag suppresses normal output and shows the number of
@@ -424,10 +1103,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--count-matches")
-        return self
 
-    @_logger
+    @_flag("--crlf")
     def crlf(self) -> Ripgrepy:
         """
         When enabled, ripgrep will treat CRLF (\\r\\n) as a line terminator
@@ -445,10 +1122,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--crlf")
-        return self
 
-    @_logger
+    @_flag("--debug")
     def debug(self) -> Ripgrepy:
         """
         Show debug messages. Please use this when filing a bug report.
@@ -464,10 +1139,7 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--debug")
-        return self
 
-    @_logger
     def dfa_size_limit(self, num_suffix: int) -> Ripgrepy:
         """
         The upper size limit of the regex DFA. The default limit is 10M.
@@ -483,11 +1155,9 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--dfa-size-limit")
-        self.command.append(str(num_suffix))
+        self.command.extend(("--dfa-size-limit", str(num_suffix)))
         return self
 
-    @_logger
     def encoding(self, encoding: str) -> Ripgrepy:
         """
         Specify the text encoding that ripgrep will use on all files
@@ -513,11 +1183,9 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--encoding")
-        self.command.append(encoding)
+        self.command.extend(("--encoding", encoding))
         return self
 
-    @_logger
     def file(self, pattern: str) -> Ripgrepy:
         """
         Search for patterns from the given file, with one pattern per line.
@@ -534,11 +1202,10 @@ class Ripgrepy(object):
         :return: [description]
         :rtype: Ripgrepy
         """
-        self.command.append("--file")
-        self.command.append(pattern)
+        self.command.extend(("--file", pattern))
         return self
 
-    @_logger
+    @_flag("--files")
     def files(self) -> Ripgrepy:
         """
         Print each file that would be searched without actually performing
@@ -548,10 +1215,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--files")
-        return self
 
-    @_logger
+    @_flag("--files-with-matches")
     def files_with_matches(self) -> Ripgrepy:
         """
         Only print the paths with at least one match.
@@ -561,10 +1226,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--files-with-matches")
-        return self
 
-    @_logger
+    @_flag("--files-without-match")
     def files_without_match(self) -> Ripgrepy:
         """
         Only print the paths that contain zero matches. This
@@ -575,10 +1238,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--files-without-match")
-        return self
 
-    @_logger
+    @_flag("--fixed-strings")
     def fixed_strings(self) -> Ripgrepy:
         """
         Treat the pattern as a literal string instead of a regular
@@ -590,10 +1251,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--fixed-strings")
-        return self
 
-    @_logger
+    @_flag("--follow")
     def follow(self) -> Ripgrepy:
         """
         When this flag is enabled, ripgrep will follow symbolic links while
@@ -606,10 +1265,7 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--follow")
-        return self
 
-    @_logger
     def glob(self, glob_pattern: str) -> Ripgrepy:
         """
         Include or exclude files and directories for searching that match
@@ -622,11 +1278,24 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--glob")
-        self.command.append(glob_pattern)
+        self.command.extend(("--glob", glob_pattern))
         return self
 
-    @_logger
+    def exclude_generated(self) -> Ripgrepy:
+        """
+        Exclude lock files, minified bundles, source maps and snapshots.
+        These are often large, rarely what a search is looking for and
+        can take up most of the search time in a repository. Use glob
+        for finer control.
+
+        :return: self
+        :rtype: Ripgrepy
+        """
+        for glob_pattern in _GENERATED_GLOBS:
+            self.command.extend(("--glob", glob_pattern))
+        return self
+
+    @_flag("--hidden")
     def hidden(self) -> Ripgrepy:
         """
         Search hidden files and directories. By default, hidden files and
@@ -639,10 +1308,7 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--hidden")
-        return self
 
-    @_logger
     def iglob(self, glob_pattern: str) -> Ripgrepy:
         """
         Include or exclude files and directories for searching that match
@@ -656,11 +1322,10 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--iglob")
-        self.command.append(glob_pattern)
+        self.command.extend(("--iglob", glob_pattern))
         return self
 
-    @_logger
+    @_flag("--ignore-case")
     def ignore_case(self) -> Ripgrepy:
         """
         When this flag is provided, the given patterns will be searched
@@ -672,10 +1337,7 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--ignore-case")
-        return self
 
-    @_logger
     def ignore_file(self, path: str) -> Ripgrepy:
         """
         Specifies a path to one or more .gitignore format rules files.
@@ -694,11 +1356,10 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--ignore-file")
-        self.command.append(path)
+        self.command.extend(("--ignore-file", path))
         return self
 
-    @_logger
+    @_flag("--ignore-file-case-insensitive")
     def ignore_file_case_insensitive(self) -> Ripgrepy:
         """
         Process ignore files (.gitignore, .ignore, etc.) case
@@ -711,10 +1372,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--ignore-file-case-insensitive")
-        return self
 
-    @_logger
+    @_flag("--invert-match")
     def invert_match(self) -> Ripgrepy:
         """
         Invert matching. Show lines that do not match the given patterns.
@@ -722,10 +1381,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--invert-match")
-        return self
 
-    @_logger
+    @_flag("--json")
     def json(self) -> Ripgrepy:
         """
         Enable printing results in a JSON Lines format.
@@ -776,10 +1433,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--json")
-        return self
 
-    @_logger
+    @_flag("--line-buffered")
     def line_buffered(self) -> Ripgrepy:
         """
         When enabled, ripgrep will use line buffering. That is, whenever a
@@ -799,10 +1454,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--line-buffered")
-        return self
 
-    @_logger
+    @_flag("--line-number")
     def line_number(self) -> Ripgrepy:
         """
         Show line numbers (1-based). This is enabled by default when
@@ -811,10 +1464,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--line-number")
-        return self
 
-    @_logger
+    @_flag("--line-regexp")
     def line_regexp(self) -> Ripgrepy:
         """
         Only show matches surrounded by line boundaries. This is equivalent
@@ -827,10 +1478,7 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--line-regexp")
-        return self
 
-    @_logger
     def max_columns(self, num: int) -> Ripgrepy:
         """
         Don't print lines longer than this limit in bytes. Longer lines are
@@ -843,11 +1491,10 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--max-columns")
-        self.command.append(str(num))
+        self.command.extend(("--max-columns", str(num)))
         return self
 
-    @_logger
+    @_flag("--max-columns-preview")
     def max_columns_preview(self) -> Ripgrepy:
         """
         When the --max-columns flag is used, ripgrep will by default
@@ -864,10 +1511,7 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--max-columns-preview")
-        return self
 
-    @_logger
     def max_count(self, num: int) -> Ripgrepy:
         """
         Limit the number of matching lines per file searched to NUM.
@@ -877,11 +1521,9 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--max-count")
-        self.command.append(str(num))
+        self.command.extend(("--max-count", str(num)))
         return self
 
-    @_logger
     def max_depth(self, num: int) -> Ripgrepy:
         """
         Limit the depth of directory traversal to NUM levels beyond the
@@ -897,11 +1539,9 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--max-depth")
-        self.command.append(str(num))
+        self.command.extend(("--max-depth", str(num)))
         return self
 
-    @_logger
     def max_filesize(self, num_suffix: str) -> Ripgrepy:
         """
         Ignore files larger than NUM in size. This does not apply to
@@ -918,11 +1558,10 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--max-filesize")
-        self.command.append(num_suffix)
+        self.command.extend(("--max-filesize", num_suffix))
         return self
 
-    @_logger
+    @_flag("--mmap")
     def mmap(self) -> Ripgrepy:
         """
         Search using memory maps when possible. This is enabled by default
@@ -940,10 +1579,30 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--mmap")
+
+    def auto_mmap(self, threshold: int = 256 * 1024) -> Ripgrepy:
+        """
+        Adds --mmap when a single file larger than threshold bytes is
+        searched and matching is not inverted, which is the case where
+        memory maps are fastest. This is the same choice ripgrep makes on
+        its own on most platforms, but not on every version for macOS.
+        Call it after invert_match if both are used.
+
+        :param threshold: Minimum file size in bytes. Defaults to 256 KiB
+        :type threshold: int
+        :return: self
+        :rtype: Ripgrepy
+        """
+        paths = self._search_paths()
+        if (
+            len(paths) == 1
+            and "--invert-match" not in self.command
+            and os.path.isfile(paths[0])
+            and os.path.getsize(paths[0]) > threshold
+        ):
+            self.command.append("--mmap")
         return self
 
-    @_logger
     def multiline(self) -> Ripgrepy:
         """
         Enable matching across multiple lines.
@@ -985,15 +1644,19 @@ class Ripgrepy(object):
         about matches spanning at most one line, then it is always better
         to disable multiline mode.
 
+        As every searched file is held in memory, a --max-filesize of
+        MULTILINE_MAX_FILESIZE is added unless max_filesize was already
+        chained.
+
         This flag can be disabled with --no-multiline.
 
         :return: self
         :rtype: Ripgrepy
         """
+        self._cap_filesize()
         self.command.append("--multiline")
         return self
 
-    @_logger
     def multiline_dotall(self) -> Ripgrepy:
         """
         This flag enables "dot all" in your regex pattern, which causes .
@@ -1016,13 +1679,30 @@ class Ripgrepy(object):
 
         This flag can be disabled with --no-multiline-dotall.
 
+        Like multiline, this adds a --max-filesize of MULTILINE_MAX_FILESIZE
+        unless max_filesize was already chained.
+
         :return: self
         :rtype: Ripgrepy
         """
+        self._cap_filesize()
         self.command.append("--multiline-dotall")
         return self
 
-    @_logger
+    def multiline_pcre2_fast(self) -> Ripgrepy:
+        """
+        Preset for --pcre2 --multiline. PCRE2 compiles the regex to machine
+        code, which can make line anchored patterns such as ^\\w+$ several
+        times faster than the default engine on whitespace or number
+        delimited data. Benchmark the default engine first for anything
+        else, it is usually the faster one.
+
+        :return: self
+        :rtype: Ripgrepy
+        """
+        return self.pcre2().multiline()
+
+    @_flag("--no-config")
     def no_config(self) -> Ripgrepy:
         """
         Never read configuration files. When this flag is present, ripgrep
@@ -1035,10 +1715,22 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-config")
-        return self
 
-    @_logger
+    @_flag("--no-encoding")
+    def no_encoding(self) -> Ripgrepy:
+        """
+        Disable all transcoding and search the raw bytes of each file. No
+        BOM sniffing is done and, with PCRE2, invalid UTF-8 is not
+        replaced. Together with no_unicode this is the fastest way to
+        search ASCII or binary data.
+
+        This flag overrides --encoding.
+
+        :return: self
+        :rtype: Ripgrepy
+        """
+
+    @_flag("--no-filename")
     def no_filename(self) -> Ripgrepy:
         """
         Never print the file path with the matched lines. This is the
@@ -1050,10 +1742,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-filename")
-        return self
 
-    @_logger
+    @_flag("--no-heading")
     def no_heading(self) -> Ripgrepy:
         """
         Don't group matches by each file. If --no-heading is provided in
@@ -1066,10 +1756,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-heading")
-        return self
 
-    @_logger
+    @_flag("--no-ignore")
     def no_ignore(self) -> Ripgrepy:
         """
         Don't respect ignore files (.gitignore, .ignore, etc.). This
@@ -1080,10 +1768,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-ignore")
-        return self
 
-    @_logger
+    @_flag("--no-ignore-dot")
     def no_ignore_dot(self) -> Ripgrepy:
         """
         Don't respect .ignore files.
@@ -1093,10 +1779,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-ignore-dot")
-        return self
 
-    @_logger
+    @_flag("--no-ignore-global")
     def no_ignore_global(self) -> Ripgrepy:
         """
         Don't respect ignore files that come from "global" sources such as
@@ -1108,10 +1792,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-ignore-global")
-        return self
 
-    @_logger
+    @_flag("--no-ignore-messages")
     def no_ignore_messages(self) -> Ripgrepy:
         """
         Suppresses all error messages related to parsing ignore files such
@@ -1122,10 +1804,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-ignore-messages")
-        return self
 
-    @_logger
+    @_flag("--no-ignore-parent")
     def no_ignore_parent(self) -> Ripgrepy:
         """
         Don't respect ignore files (.gitignore, .ignore, etc.) in parent
@@ -1136,10 +1816,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-ignore-parent")
-        return self
 
-    @_logger
+    @_flag("--no-ignore-vcs")
     def no_ignore_vcs(self) -> Ripgrepy:
         """
         Don't respect version control ignore files (.gitignore, etc.). This
@@ -1151,10 +1829,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-ignore-vcs")
-        return self
 
-    @_logger
+    @_flag("--no-line-number")
     def no_line_number(self) -> Ripgrepy:
         """
         Suppress line numbers. This is enabled by default when not
@@ -1163,10 +1839,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-line-number")
-        return self
 
-    @_logger
+    @_flag("--no-messages")
     def no_messages(self) -> Ripgrepy:
         """
         Suppress all error messages related to opening and reading files.
@@ -1178,10 +1852,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-messages")
-        return self
 
-    @_logger
+    @_flag("--no-mmap")
     def no_mmap(self) -> Ripgrepy:
         """
         Never use memory maps, even when they might be faster.
@@ -1191,10 +1863,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-mmap")
-        return self
 
-    @_logger
+    @_flag("--no-pcre2-unicode")
     def no_pcre2_unicode(self) -> Ripgrepy:
         """
         When PCRE2 matching is enabled, this flag will disable Unicode
@@ -1232,10 +1902,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-pcre2-unicode")
-        return self
 
-    @_logger
+    @_flag("--null")
     def null(self) -> Ripgrepy:
         """
         Whenever a file path is printed, follow it with a NUL byte. This
@@ -1246,10 +1914,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--null")
-        return self
 
-    @_logger
+    @_flag("--null-data")
     def null_data(self) -> Ripgrepy:
         """
         Enabling this option causes ripgrep to use NUL as a line terminator
@@ -1271,10 +1937,23 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--null-data")
-        return self
 
-    @_logger
+    def binary_memory_safe(self, cap: str = "2G") -> Ripgrepy:
+        """
+        Preset for searching large binary files without running out of
+        memory. ripgrep holds at least one whole line in memory, and a
+        binary file can be gigabytes without a single newline. With
+        --null-data lines end at NUL bytes instead, which keeps them short,
+        and files larger than cap are skipped.
+
+        :param cap: The --max-filesize to use. Defaults to 2G
+        :type cap: str
+        :return: self
+        :rtype: Ripgrepy
+        """
+        return self.null_data().max_filesize(cap)
+
+    @_flag("--one-file-system")
     def one_file_system(self) -> Ripgrepy:
         """
         When enabled, ripgrep will not cross file system boundaries
@@ -1293,10 +1972,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--one-file-system")
-        return self
 
-    @_logger
+    @_flag("--only-matching")
     def only_matching(self) -> Ripgrepy:
         """
         Print only the matched (non-empty) parts of a matching line, with
@@ -1305,10 +1982,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--only-matching")
-        return self
 
-    @_logger
+    @_flag("--passthru")
     def passthru(self) -> Ripgrepy:
         """
         Print both matching and non-matching lines.
@@ -1323,30 +1998,7 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--passthru")
-        return self
 
-    @_logger
-    def path_seprator(self, separator: str) -> Ripgrepy:
-        """
-        Set the path separator to use when printing file paths. This
-        defaults to your platform's path separator, which is / on Unix and
-        \\ on Windows. This flag is intended for overriding the default when
-        the environment demands it (e.g., cygwin). A path separator is
-        limited to a single byte.
-
-        :param separator: separator
-        :type separator: str
-        :return: self
-        :rtype: Ripgrepy
-        """
-        # This method (path_seprator) is a backwards-compatible alias for
-        # `path_separator`, as the `path_separator` method used to contain a typo.
-        self.command.append("--path-separator")
-        self.command.append(separator)
-        return self
-    
-    @_logger
     def path_separator(self, separator: str) -> Ripgrepy:
         """
         Set the path separator to use when printing file paths. This
@@ -1360,11 +2012,9 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--path-separator")
-        self.command.append(separator)
+        self.command.extend(("--path-separator", separator))
         return self
 
-    @_logger
     def pcre2(self) -> Ripgrepy:
         """
         When this flag is present, ripgrep will use the PCRE2 regex engine
@@ -1383,11 +2033,12 @@ class Ripgrepy(object):
 
         :return: self
         :rtype: Ripgrepy
+        :raises RuntimeError: If ripgrep was built without PCRE2
         """
+        self._require_pcre2()
         self.command.append("--pcre2")
         return self
 
-    @_logger
     def pcre2_version(self) -> Ripgrepy:
         """
         When this flag is present, ripgrep will print the version of PCRE2
@@ -1398,11 +2049,10 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.regex_pattern = ""
+        self._mode = "--pcre2-version"
         self.command.append("--pcre2-version")
         return self
 
-    @_logger
     def pre(self, command: str) -> Ripgrepy:
         """
         For each input FILE, search the standard output of COMMAND FILE
@@ -1457,11 +2107,9 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--pre")
-        self.command.append(command)
+        self.command.extend(("--pre", command))
         return self
 
-    @_logger
     def pre_glob(self, glob: str) -> Ripgrepy:
         """
         This flag works in conjunction with the --pre flag. Namely, when
@@ -1492,11 +2140,10 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--pre-glob")
-        self.command.append(glob)
+        self.command.extend(("--pre-glob", glob))
         return self
 
-    @_logger
+    @_flag("--pretty")
     def pretty(self) -> Ripgrepy:
         """
         This is a convenience alias for --color always --heading
@@ -1507,10 +2154,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--pretty")
-        return self
 
-    @_logger
+    @_flag("--quiet")
     def quiet(self) -> Ripgrepy:
         """
         Do not print anything to stdout. If a match is found in a file,
@@ -1524,10 +2169,7 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--quiet")
-        return self
 
-    @_logger
     def regex_size_limit(self, num_suffix: str) -> Ripgrepy:
         """
         The upper size limit of the compiled regex. The default limit is
@@ -1541,11 +2183,9 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--regex-size-limit")
-        self.command.append(num_suffix)
+        self.command.extend(("--regex-size-limit", num_suffix))
         return self
 
-    @_logger
     def regexp(self, pattern: str) -> Ripgrepy:
         """
         A pattern to search for. This option can be provided multiple
@@ -1569,11 +2209,9 @@ class Ripgrepy(object):
         :rtype: Ripgrepy
         """
         self.regex_pattern = ""
-        self.command.append("--regexp")
-        self.command.append(pattern)
+        self.command.extend(("--regexp", pattern))
         return self
 
-    @_logger
     def replace(self, replacement_text: str) -> Ripgrepy:
         """
         Replace every match with the text given when printing results.
@@ -1594,11 +2232,10 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--replace")
-        self.command.append(replacement_text)
+        self.command.extend(("--replace", replacement_text))
         return self
 
-    @_logger
+    @_flag("--search-zip")
     def search_zip(self) -> Ripgrepy:
         """
         Search in compressed files. Currently gzip, bzip2, xz, LZ4, LZMA,
@@ -1610,10 +2247,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--search-zip")
-        return self
 
-    @_logger
+    @_flag("--smart-case")
     def smart_case(self) -> Ripgrepy:
         """
         Searches case insensitively if the pattern is all lowercase. Search
@@ -1624,10 +2259,7 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--smart-case")
-        return self
 
-    @_logger
     def sort(self, sort_by: str) -> Ripgrepy:
         """
         This flag enables sorting of results in ascending order. The
@@ -1655,11 +2287,9 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--sort")
-        self.command.append(sort_by)
+        self.command.extend(("--sort", sort_by))
         return self
 
-    @_logger
     def sortr(self, sort_by: str) -> Ripgrepy:
         """
         This flag enables sorting of results in descending order. The
@@ -1687,11 +2317,10 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--sortr")
-        self.command.append(sort_by)
+        self.command.extend(("--sortr", sort_by))
         return self
 
-    @_logger
+    @_flag("--stats")
     def stats(self) -> Ripgrepy:
         """
         Print aggregate statistics about this ripgrep search. When this
@@ -1710,10 +2339,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--stats")
-        return self
 
-    @_logger
+    @_flag("--text")
     def text(self) -> Ripgrepy:
         """
         Search binary files as if they were text. When this flag is
@@ -1735,10 +2362,7 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--text")
-        return self
 
-    @_logger
     def threads(self, num: int) -> Ripgrepy:
         """
         The approximate number of threads to use. A value of 0 (which is
@@ -1750,11 +2374,25 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--threads")
-        self.command.append(str(num))
+        self.command.extend(("--threads", str(num)))
         return self
 
-    @_logger
+    def threads_auto(self) -> Ripgrepy:
+        """
+        Use half the logical CPUs, roughly one thread per physical core,
+        which avoids oversubscribing hyperthreads on memory bound searches.
+        Nothing is added when a single file is searched, as ripgrep does
+        not split one file across threads.
+
+        :return: self
+        :rtype: Ripgrepy
+        """
+        paths = self._search_paths()
+        if len(paths) == 1 and os.path.isfile(paths[0]):
+            return self
+        return self.threads(max((os.cpu_count() or 2) // 2, 1))
+
+    @_flag("--trim", once=True)
     def trim(self) -> Ripgrepy:
         """
         When set, all ASCII whitespace at the beginning of each line
@@ -1765,26 +2403,27 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--trim")
-        return self
 
-    @_logger
-    def type_(self, type_pattern: str) -> Ripgrepy:
+    def type_(self, type_pattern: str, *type_patterns: str) -> Ripgrepy:
         """
         Only search files matching TYPE. Multiple type flags may be
-        provided. Use the --type-list flag to list all available types.
+        provided, either by chaining or in one call as in type_("py", "rust").
+        Use the --type-list flag to list all available types.
 
         :param type_pattern: Type pattern
         :type type_pattern: str
-        :return: [description]
+        :param type_patterns: More type patterns
+        :type type_patterns: str
+        :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--type")
-        self.command.append(type_pattern)
+        command = self.command
+        command.extend(("--type", type_pattern))
+        for type_pattern in type_patterns:
+            command.extend(("--type", type_pattern))
         return self
 
-    @_logger
-    def type_add(self, type_spec: str) -> Ripgrepy:
+    def type_add(self, type_spec: str, *type_specs: str) -> Ripgrepy:
         """
         Add a new glob for a particular file type. Only one glob can be
         added at a time. Multiple --type-add flags can be provided. Unless
@@ -1815,16 +2454,22 @@ class Ripgrepy(object):
         Note that type names must consist only of Unicode letters or
         numbers. Punctuation characters are not allowed.
 
+        Several type specs can be added in one call.
+
         :param type_spec: Type spec
         :type type_spec: str
+        :param type_specs: More type specs
+        :type type_specs: str
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--type-add")
-        self.command.append(type_spec)
+        command = self.command
+        command.extend(("--type-add", type_spec))
+        for type_spec in type_specs:
+            command.extend(("--type-add", type_spec))
         return self
 
-    @_logger
+    @_flag("--type-clear")
     def type_clear(self) -> Ripgrepy:
         """
         Clear the file type globs previously defined for TYPE. This only
@@ -1837,10 +2482,7 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--type-clear")
-        return self
 
-    @_logger
     def type_list(self) -> Ripgrepy:
         """
         Show all supported file types and their corresponding globs.
@@ -1848,27 +2490,32 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.regex_pattern = ""
-        self.path = ""
-        self.command.append("--type-list")
+        if self._mode != "--type-list":
+            self._mode = "--type-list"
+            self.command.append("--type-list")
         return self
 
-    @_logger
-    def type_not(self, type_pattern: str) -> Ripgrepy:
+    def type_not(self, type_pattern: str, *type_patterns: str) -> Ripgrepy:
         """
         Do not search files matching TYPE. Multiple type-not flags may be
-        provided. Use the --type-list flag to list all available types
+        provided, either by chaining or in one call as in
+        type_not("js", "css"). Use the --type-list flag to list all
+        available types
 
         :param type_pattern: Type pattern
         :type type_pattern: str
-        :return: [description]
+        :param type_patterns: More type patterns
+        :type type_patterns: str
+        :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--type-not")
-        self.command.append(type_pattern)
+        command = self.command
+        command.extend(("--type-not", type_pattern))
+        for type_pattern in type_patterns:
+            command.extend(("--type-not", type_pattern))
         return self
 
-    @_logger
+    @_flag("--unrestricted")
     def unrestricted(self) -> Ripgrepy:
         """
         Reduce the level of "smart" searching. A single -u won't respect
@@ -1881,10 +2528,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--unrestricted")
-        return self
 
-    @_logger
+    @_flag("--vimgrep", once=True)
     def vimgrep(self) -> Ripgrepy:
         """
         Show results with every match on its own line, including line
@@ -1894,10 +2539,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--vimgrep")
-        return self
 
-    @_logger
+    @_flag("--with-filename")
     def with_filename(self) -> Ripgrepy:
         """
         Display the file path for matches. This is the default when more
@@ -1911,10 +2554,8 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--with-filename")
-        return self
 
-    @_logger
+    @_flag("--word-regexp")
     def word_regexp(self) -> Ripgrepy:
         """
         Only show matches surrounded by word boundaries. This is roughly
@@ -1926,11 +2567,9 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--word-regexp")
-        return self
 
     ### Options for version 12 of ripgrep
-    @_logger
+    @_flag("--no-unicode", once=True)
     def no_unicode(self) -> Ripgrepy:
         """
         By default, ripgrep will enable "Unicode mode" in all of its
@@ -1977,10 +2616,33 @@ class Ripgrepy(object):
         :return: self
         :rtype: Ripgrepy
         """
-        self.command.append("--no-unicode")
-        return self
 
-    @_logger
+    def smart_unicode(self) -> Ripgrepy:
+        """
+        Adds --no-unicode when it cannot change the results. That is the
+        case when every pattern is ASCII and uses no escapes, no . and no
+        negated classes, matching is case sensitive and word_regexp is not
+        used, as word boundaries follow Unicode mode. Call it after the
+        patterns and options have been chained. Patterns read with
+        file() are not known here, so they keep Unicode mode. If the
+        searched text is known to be ASCII, use no_unicode() directly.
+
+        :return: self
+        :rtype: Ripgrepy
+        """
+        if not _UNICODE_FLAGS.isdisjoint(self.command):
+            return self
+        for pattern in self._patterns():
+            if (
+                not pattern.isascii()
+                or "\\" in pattern
+                or "." in pattern
+                or "[^" in pattern
+                or "(?" in pattern
+            ):
+                return self
+        return self.no_unicode()
+
     def engine(self, engine: str) -> Ripgrepy:
         """
         Specify which regular expression engine to use. When you choose a
@@ -2002,9 +2664,126 @@ class Ripgrepy(object):
         This overrides previous uses of --pcre2 and --auto-hybrid-regex
         flags.
 
-        :return: self
-        :rtype: Ripgrepy
-        """
-        self.command.append("--engine")
-        self.command.append(engine)
-        return self
+        pcre2 is usually slower than the default engine, so it is replaced
+        with default when none of the patterns use syntax that needs PCRE2
+        and no_pcre2_unicode was not chained. Chain this after regexp and
+        no_pcre2_unicode so they are taken into account. A copy made by
+        with_pattern or prepare keeps the engine chosen here, so create
+        those from a Ripgrepy with an empty pattern.
+
+        :param engine: default, pcre2 or auto
+        :type engine: str
+        :return: self
+        :rtype: Ripgrepy
+        :raises RuntimeError: If pcre2 is needed but ripgrep was built
+                without it
+        """
+        if engine == "pcre2":
+            if not self._needs_pcre2():
+                engine = "default"
+            else:
+                self._require_pcre2()
+        self.command.extend(("--engine", engine))
+        return self
+
+    def _needs_pcre2(self) -> bool:
+        # patterns read with file() are unknown, without any pattern the
+        # engine is meant for with_pattern or prepare, and the default
+        # engine ignores --no-pcre2-unicode so \w would turn Unicode
+        if "--file" in self.command or "--no-pcre2-unicode" in self.command:
+            return True
+        patterns = [p for p in self._patterns() if p]
+        return not patterns or any(_PCRE2_FEATURES.search(p) for p in patterns)
+
+    # short syntax mapping
+    #: Short syntax for byte_offset
+    b = byte_offset
+    #: Short syntax for case_sensitive
+    s = case_sensitive
+    #: Short syntax for encoding
+    E = encoding
+    #: Short syntax for file
+    f = file
+    #: Short syntax for files_with_matches
+    l = files_with_matches
+    #: Short syntax for fixed_strings
+    F = fixed_strings
+    #: Short syntax for follow
+    L = follow
+    #: Short syntax for glob
+    g = glob
+    #: Short syntax for ignore_case
+    i = ignore_case
+    #: Short syntax for invert_match
+    v = invert_match
+    #: Short syntax for line_number
+    n = line_number
+    #: Short syntax for after_context
+    A = after_context
+    #: Short syntax for before_context
+    B = before_context
+    #: Short syntax for context
+    C = context
+    #: Short syntax for line_regexp
+    x = line_regexp
+    #: Short syntax for max_columns
+    M = max_columns
+    #: Short syntax for max_count
+    m = max_count
+    #: Short syntax for multiline
+    U = multiline
+    #: Short syntax for no_filename
+    I = no_filename
+    #: Short syntax for no_line_number
+    N = no_line_number
+    #: Short syntax for only_matching
+    o = only_matching
+    #: Short syntax for pcre2
+    P = pcre2
+    #: Short syntax for pretty
+    p = pretty
+    #: Short syntax for quiet
+    q = quiet
+    #: Short syntax for regexp
+    e = regexp
+    #: Short syntax for replace
+    r = replace
+    #: Short syntax for search_zip
+    z = search_zip
+    #: Short syntax for smart_case
+    S = smart_case
+    #: Short syntax for text
+    a = text
+    #: Short syntax for threads
+    j = threads
+    #: Short syntax for type_not
+    T = type_not
+    #: Short syntax for unrestricted
+    u = unrestricted
+    #: Short syntax for with_filename
+    H = with_filename
+    #: Short syntax for word_regexp
+    w = word_regexp
+    #: Alias to run
+    run_rg = run
+    #: Backwards compatible alias, path_separator used to contain a typo
+    path_seprator = path_separator
+
+
+def run_many(frozen: Tuple[str, ...], paths: Iterable[str]) -> Iterator[RipGrepOut]:
+    """
+    Runs a command made by Ripgrepy.freeze once for each path, without
+    building the options again. Each ripgrep is started when its
+    RipGrepOut is requested, one search per path.
+
+    :param frozen: The command returned by Ripgrepy.freeze
+    :type frozen: tuple
+    :param paths: Files or directories to search one at a time
+    :type paths: Iterable
+    :return: A generator of RipGrepOut, in the order of paths
+    :rtype: Iterator
+    """
+    for path in paths:
+        command = [*frozen, os.path.expanduser(path)]
+        stderr = TemporaryFile()
+        yield RipGrepOut(_spawn(command, stderr), command, stderr)
@@ -1,17 +1,24 @@
 from _typeshed import Incomplete
-from typing import Any
+import subprocess
+from typing import IO, Any, Callable, Iterable, Iterator
 
 class RipGrepNotFound(Exception): ...
+class RipGrepError(Exception): ...
 
 class RipGrepOut:
     command: Incomplete
-    def __init__(self, _output: Any, command: list[str]) -> None: ...
+    def __init__(self, process: subprocess.Popen | None, command: list[str], stderr: IO[bytes] | None, upstream: subprocess.Popen | None = None, keep_raw: bool = False) -> None: ...
+    @property
+    def returncode(self) -> int: ...
     @property
     def as_dict(self) -> list: ...
     @property
     def as_json(self) -> str: ...
     @property
     def as_string(self) -> str: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> RipGrepOut: ...
+    def __exit__(self, *exc_info: object) -> None: ...
 
 class Ripgrepy:
     regex_pattern: Incomplete
@@ -52,8 +59,20 @@ class Ripgrepy:
     H: Incomplete
     w: Incomplete
     run_rg: Incomplete
-    def __init__(self, regex_pattern: str, path: str, rg_path: str = 'rg') -> None: ...
+    path_seprator: Incomplete
+    DEFAULT_THREADS: int
+    MULTILINE_MAX_FILESIZE: str
+    def __init__(self, regex_pattern: str, path: str | list[str], rg_path: str = 'rg', threads: int | None = None, keep_raw: bool = False, default_max_filesize: str | None = None) -> None: ...
+    @classmethod
+    def from_paths(cls, regex_pattern: str, paths: list[str], **kwargs: Any) -> Ripgrepy: ...
     def run(self) -> RipGrepOut: ...
+    def run_stream(self) -> Iterator[str | dict]: ...
+    def two_pass(self, literal_hint: str) -> Ripgrepy: ...
+    def pipe_to(self, other: Ripgrepy) -> Ripgrepy: ...
+    def c_locale(self) -> Ripgrepy: ...
+    def freeze(self) -> tuple[str, ...]: ...
+    def prepare(self) -> Callable[[str], RipGrepOut]: ...
+    def with_pattern(self, regex_pattern: str) -> Ripgrepy: ...
     def after_context(self, number: int) -> Ripgrepy: ...
     def before_context(self, number: int) -> Ripgrepy: ...
     def context(self, number: int) -> Ripgrepy: ...
@@ -74,6 +93,7 @@ class Ripgrepy:
     def fixed_strings(self) -> Ripgrepy: ...
     def follow(self) -> Ripgrepy: ...
     def glob(self, glob_pattern: str) -> Ripgrepy: ...
+    def exclude_generated(self) -> Ripgrepy: ...
     def hidden(self) -> Ripgrepy: ...
     def iglob(self, glob_pattern: str) -> Ripgrepy: ...
     def ignore_case(self) -> Ripgrepy: ...
@@ -90,9 +110,12 @@ class Ripgrepy:
     def max_depth(self, num: int) -> Ripgrepy: ...
     def max_filesize(self, num_suffix: str) -> Ripgrepy: ...
     def mmap(self) -> Ripgrepy: ...
+    def auto_mmap(self, threshold: int = ...) -> Ripgrepy: ...
     def multiline(self) -> Ripgrepy: ...
     def multiline_dotall(self) -> Ripgrepy: ...
+    def multiline_pcre2_fast(self) -> Ripgrepy: ...
     def no_config(self) -> Ripgrepy: ...
+    def no_encoding(self) -> Ripgrepy: ...
     def no_filename(self) -> Ripgrepy: ...
     def no_heading(self) -> Ripgrepy: ...
     def no_ignore(self) -> Ripgrepy: ...
@@ -107,10 +130,10 @@ class Ripgrepy:
     def no_pcre2_unicode(self) -> Ripgrepy: ...
     def null(self) -> Ripgrepy: ...
     def null_data(self) -> Ripgrepy: ...
+    def binary_memory_safe(self, cap: str = ...) -> Ripgrepy: ...
     def one_file_system(self) -> Ripgrepy: ...
     def only_matching(self) -> Ripgrepy: ...
     def passthru(self) -> Ripgrepy: ...
-    def path_seprator(self, separator: str) -> Ripgrepy: ...
     def path_separator(self, separator: str) -> Ripgrepy: ...
     def pcre2(self) -> Ripgrepy: ...
     def pcre2_version(self) -> Ripgrepy: ...
@@ -128,15 +151,19 @@ class Ripgrepy:
     def stats(self) -> Ripgrepy: ...
     def text(self) -> Ripgrepy: ...
     def threads(self, num: int) -> Ripgrepy: ...
+    def threads_auto(self) -> Ripgrepy: ...
     def trim(self) -> Ripgrepy: ...
-    def type_(self, type_pattern: str) -> Ripgrepy: ...
-    def type_add(self, type_spec: str) -> Ripgrepy: ...
+    def type_(self, type_pattern: str, *type_patterns: str) -> Ripgrepy: ...
+    def type_add(self, type_spec: str, *type_specs: str) -> Ripgrepy: ...
     def type_clear(self) -> Ripgrepy: ...
     def type_list(self) -> Ripgrepy: ...
-    def type_not(self, type_pattern: str) -> Ripgrepy: ...
+    def type_not(self, type_pattern: str, *type_patterns: str) -> Ripgrepy: ...
     def unrestricted(self) -> Ripgrepy: ...
     def vimgrep(self) -> Ripgrepy: ...
     def with_filename(self) -> Ripgrepy: ...
     def word_regexp(self) -> Ripgrepy: ...
     def no_unicode(self) -> Ripgrepy: ...
+    def smart_unicode(self) -> Ripgrepy: ...
     def engine(self, engine: str) -> Ripgrepy: ...
+
+def run_many(frozen: tuple[str, ...], paths: Iterable[str]) -> Iterator[RipGrepOut]: ...
@@ -19,8 +19,16 @@ setup(
         'Documentation': 'https://ripgrepy.readthedocs.io/',
     },
     packages=find_packages(),
+    package_data={
+        'ripgrepy': ['__init__.pyi'],
+    },
+    zip_safe=False,
+    python_requires='>=3.7',
     install_requires = [
     ],
+    extras_require={
+        'orjson': ['orjson'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3.7"
     ]
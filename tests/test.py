@@ -1,4 +1,12 @@
-from ripgrepy import Ripgrepy
+import gc
+import json
+import os
+import subprocess
+import sys
+import warnings
+import pytest
+import ripgrepy
+from ripgrepy import Ripgrepy, RipGrepError, run_many, _has_pcre2
 
 def test_base():
     rg = Ripgrepy('lol', '.').context(1).json().run()
@@ -6,3 +14,276 @@ def test_base():
     print(rg.as_string)
     print(rg.as_dict)
     print(rg.as_json)
+
+def test_from_paths():
+    rg = Ripgrepy.from_paths('lol', ['tests/lol', 'tests/test.lol'], threads=2)
+    out = rg.json().run()
+    assert rg.command[1:3] == ['--threads', '2']
+    assert {m['data']['path']['text'] for m in out.as_dict} == {'tests/lol', 'tests/test.lol'}
+
+def test_argv_tokens():
+    rg = Ripgrepy('lol "quoted"', 'tests').glob('*.lol').replace('a b')
+    assert rg.command[1:] == ['--glob', '*.lol', '--replace', 'a b']
+    rg.run()
+    assert rg.command[-2:] == ['lol "quoted"', 'tests']
+
+def test_with_pattern():
+    base = Ripgrepy('', 'tests/test.lol').json()
+    hello = base.with_pattern('hello').run()
+    lol = base.with_pattern('lol').run()
+    assert base.command == lol.command[:-2]
+    assert [m['data']['lines']['text'] for m in hello.as_dict] == ['hello\n']
+    assert [m['data']['lines']['text'] for m in lol.as_dict] == ['lolol\n']
+
+def test_prepare():
+    search = Ripgrepy('', 'tests/test.lol').json().prepare()
+    assert [m['data']['lines']['text'] for m in search('-?hello').as_dict] == ['hello\n']
+    assert search('nothing here').as_dict == []
+    assert search('').as_dict == []
+    assert search('')._process is None
+    search = Ripgrepy('', 'tests/test.lol').regexp('hello').json().prepare()
+    assert len(search('').as_dict) == 1
+
+def test_run_stream():
+    assert list(Ripgrepy('lol', 'tests/test.lol').run_stream()) == ['lolol\n']
+    matches = Ripgrepy('lol', 'tests/lol').json().run_stream()
+    assert next(matches)['data']['lines']['text'] == 'lol\n'
+    matches.close()
+    with pytest.raises(RipGrepError, match='regex parse error'):
+        list(Ripgrepy('(', 'tests').json().run_stream())
+    with pytest.raises(RipGrepError):
+        list(Ripgrepy('(', 'tests').run_stream())
+
+def test_auto_mmap():
+    assert '--mmap' not in Ripgrepy('lol', 'tests/test.lol').auto_mmap().command
+    assert '--mmap' in Ripgrepy('lol', 'tests/test.lol').auto_mmap(0).command
+    assert '--mmap' not in Ripgrepy('lol', 'tests').auto_mmap(0).command
+
+def test_c_locale():
+    rg = Ripgrepy('http', 'tests/lol').c_locale()
+    assert rg.run().as_string == 'http://lol.com\n'
+
+def test_smart_unicode():
+    assert '--no-unicode' in Ripgrepy('lol', 'tests/lol').smart_unicode().command
+    assert '--no-unicode' not in Ripgrepy(r'\w+', 'tests/lol').smart_unicode().command
+    assert '--no-unicode' not in Ripgrepy('lol', 'tests/lol').ignore_case().smart_unicode().command
+    assert '--no-unicode' not in Ripgrepy('foo', 'tests/lol').word_regexp().smart_unicode().command
+
+def test_multiline_max_filesize():
+    assert Ripgrepy('a', 'tests').multiline().command[1:] == ['--max-filesize', '1G', '--multiline']
+    rg = Ripgrepy('a', 'tests').max_filesize('10M').multiline().multiline_dotall()
+    assert rg.command[1:] == ['--max-filesize', '10M', '--multiline', '--multiline-dotall']
+
+def test_threads_auto():
+    assert '--threads' not in Ripgrepy('lol', 'tests/lol').threads_auto().command
+    assert '--threads' in Ripgrepy('lol', 'tests').threads_auto().command
+
+def test_quiet_returncode():
+    assert Ripgrepy('lol', 'tests').quiet().run().returncode == 0
+    assert Ripgrepy('nothing here', 'tests/lol').quiet().run().returncode == 1
+
+def test_engine_pcre2_downgrade():
+    assert Ripgrepy('lol', 'tests').engine('pcre2').command[1:] == ['--engine', 'default']
+    if _has_pcre2(Ripgrepy('', 'tests').command[0]):
+        assert Ripgrepy('lol(?=\\.com)', 'tests').engine('pcre2').command[1:] == ['--engine', 'pcre2']
+        assert Ripgrepy('a\\vb', 'tests').engine('pcre2').command[1:] == ['--engine', 'pcre2']
+        assert Ripgrepy('', 'tests').engine('pcre2').command[1:] == ['--engine', 'pcre2']
+        rg = Ripgrepy('lol', 'tests').no_pcre2_unicode().engine('pcre2')
+        assert rg.command[1:] == ['--no-pcre2-unicode', '--engine', 'pcre2']
+    else:
+        with pytest.raises(RuntimeError):
+            Ripgrepy('lol(?=\\.com)', 'tests').engine('pcre2')
+        with pytest.raises(RuntimeError):
+            Ripgrepy('a\\vb', 'tests').engine('pcre2')
+        with pytest.raises(RuntimeError):
+            Ripgrepy('', 'tests').pcre2()
+        with pytest.raises(RuntimeError):
+            Ripgrepy('lol', 'tests').no_pcre2_unicode().engine('pcre2')
+
+def test_default_max_filesize():
+    rg = Ripgrepy('lol', 'tests', default_max_filesize='1M').multiline()
+    assert rg.command[1:] == ['--max-filesize', '1M', '--multiline']
+
+def test_variadic_types():
+    rg = Ripgrepy('lol', 'tests').type_('py', 'rust').type_not('js')
+    assert rg.command[1:] == ['--type', 'py', '--type', 'rust', '--type-not', 'js']
+
+def test_run_many():
+    frozen = Ripgrepy('lol', '').json().freeze()
+    outs = run_many(frozen, ['tests/lol', 'tests/test.lol'])
+    assert [len(out.as_dict) for out in outs] == [2, 1]
+    frozen = Ripgrepy('', '').regexp('hello').json().freeze()
+    assert [len(out.as_dict) for out in run_many(frozen, ['tests/test.lol'])] == [1]
+    with pytest.raises(ValueError):
+        Ripgrepy('', '').json().freeze()
+
+def test_stdin(tmp_path):
+    # only an explicit - reads the stdin of the host process
+    (tmp_path / 'a').write_text('a\n')
+    code = ("import sys; from ripgrepy import Ripgrepy; "
+            "print(Ripgrepy('st[d]in data', sys.argv[1:]).run().as_string, end='')")
+    for paths, expected in (([], ''), (['-'], 'stdin data\n')):
+        out = subprocess.run([sys.executable, '-c', code, *paths], input='stdin data\n',
+                             capture_output=True, text=True, cwd=tmp_path,
+                             env={**os.environ, 'PYTHONPATH': os.getcwd()})
+        assert out.stdout == expected
+
+def test_idempotent_flags():
+    rg = Ripgrepy('lol', 'tests').trim().vimgrep().trim().vimgrep().no_unicode().smart_unicode()
+    assert rg.command[1:] == ['--trim', '--vimgrep', '--no-unicode']
+
+def test_type_list():
+    out = Ripgrepy('lol', 'tests').type_list().run()
+    assert out.command[1:] == ['--type-list']
+    assert 'py: ' in out.as_string
+
+def test_exclude_generated():
+    rg = Ripgrepy('lol', 'tests').exclude_generated()
+    assert rg.command[1:3] == ['--glob', '!*.lock']
+    assert rg.run().as_string
+
+def test_empty_pattern():
+    out = Ripgrepy('', 'tests').json().run()
+    assert out.as_dict == []
+    assert out.returncode == 1
+
+def test_pattern_flags():
+    out = Ripgrepy('', 'tests/lol').files().run()
+    assert out.returncode == 0
+    assert out.as_string == 'tests/lol\n'
+    out = Ripgrepy('', 'tests').regexp('l+ol').glob('*.lol').two_pass('lol').run()
+    assert '' not in out.command
+    assert out.command[-1] == 'tests/test.lol'
+    assert out.as_string == 'tests/test.lol:lolol\n'
+
+def test_as_dict_error():
+    out = Ripgrepy('(', 'tests').json().run()
+    with pytest.raises(RipGrepError, match='regex parse error'):
+        out.as_dict
+    with pytest.raises(RipGrepError):
+        out.as_json
+
+def test_close():
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        Ripgrepy('l', 'tests').run()
+        gc.collect()
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+    with Ripgrepy('l', 'tests').run() as out:
+        pass
+    assert out._process.returncode is not None
+
+def test_two_pass():
+    single = Ripgrepy('l+ol', 'tests').glob('*.lol').run().as_string
+    out = Ripgrepy('l+ol', 'tests').glob('*.lol').two_pass('lol').run()
+    assert out.command[-2:] == ['l+ol', 'tests/test.lol']
+    assert out.as_string == single == 'tests/test.lol:lolol\n'
+    out = Ripgrepy('l+ol', 'tests/test.lol').two_pass('lol').run()
+    assert out.as_string == 'lolol\n'
+
+def test_two_pass_forwards_file_selection():
+    rg = Ripgrepy('lol', 'tests').replace('--hidden').glob('*.lol').type_not('py').two_pass('lol')
+    assert rg._files_with_literal(['tests']) == ['tests/test.lol']
+    rg = Ripgrepy('lol', 'tests').iglob('*.LOL').smart_case().two_pass('LOL')
+    assert rg._files_with_literal(['tests']) == ['tests/test.lol']
+
+def test_two_pass_no_encoding(tmp_path):
+    # no BOM, so only an explicit encoding finds the text
+    (tmp_path / 'utf16.txt').write_bytes('lol\n'.encode('utf-16-le'))
+    rg = Ripgrepy('lol', str(tmp_path)).encoding('utf-16le').two_pass('lol')
+    assert rg._files_with_literal([str(tmp_path)]) == [str(tmp_path / 'utf16.txt')]
+    assert rg.no_encoding()._files_with_literal([str(tmp_path)]) == []
+
+def test_two_pass_no_files():
+    hint = 'zz' + 'q' * 3
+    out = Ripgrepy('lol', 'tests').json().two_pass(hint).run()
+    assert out.command[-1] == 'lol'
+    assert out.as_dict == []
+    assert out.returncode == 1
+
+def test_two_pass_first_pass_error():
+    out = Ripgrepy('lol', 'nonexistent_dir').two_pass('lol').run()
+    assert out.command[-2:] == ['lol', 'nonexistent_dir']
+    assert out.returncode == 2
+    assert 'nonexistent_dir' in out.as_string
+    out = Ripgrepy('lol', 'tests').type_('nosuchtype').json().two_pass('lol').run()
+    with pytest.raises(RipGrepError, match='nosuchtype'):
+        out.as_dict
+
+def test_two_pass_argv_limit(monkeypatch):
+    monkeypatch.setattr(ripgrepy, '_MAX_ARGV_BYTES', 0)
+    out = Ripgrepy('l+ol', 'tests').glob('*.lol').two_pass('lol').run()
+    assert out.command[-2:] == ['l+ol', 'tests']
+    assert out.as_string == 'tests/test.lol:lolol\n'
+
+def test_repr_str():
+    out = Ripgrepy('lol', 'tests/lol').run()
+    # repr does not read the output
+    assert ' unread ' in repr(out)
+    assert out._lines is None
+    assert str(out) == 'lol\nhttp://lol.com\n'
+    assert repr(out).startswith('<RipGrepOut returncode=0 lines=2 bytes=19 ')
+    out = Ripgrepy('(', 'tests').run()
+    out._process.wait()
+    assert repr(out).startswith('<RipGrepOut returncode=2 unread ')
+    assert 'regex parse error' in out.as_string
+    assert out.returncode == 2
+    assert repr(Ripgrepy('', 'tests').run()).startswith('<RipGrepOut returncode=1 lines=0 ')
+
+def test_release_raw():
+    out = Ripgrepy('lol', 'tests/lol').json().run()
+    assert len(out.as_dict) == 2
+    assert str(out).startswith('<RipGrepOut returncode=0 matches=2 ')
+    with pytest.raises(TypeError):
+        out.as_string
+    out = Ripgrepy('lol', 'tests/lol', keep_raw=True).json().run()
+    assert len(out.as_dict) == 2
+    assert '"type":"match"' in out.as_string
+
+def test_pipe_to():
+    out = Ripgrepy('lol', 'tests/lol').pipe_to(Ripgrepy('http', '-')).run()
+    assert out.as_string == 'http://lol.com\n'
+    assert out._process.returncode == 0
+    assert out._upstream.returncode == 0
+    out = Ripgrepy('(', 'tests/lol').pipe_to(Ripgrepy('http', '-')).run()
+    assert 'regex parse error' in out.as_string
+    assert out._process.returncode == 1
+    assert out._upstream.returncode == 2
+    assert out.returncode == 2
+    out = Ripgrepy('(', 'tests/lol').pipe_to(Ripgrepy('http', '-').json()).run()
+    with pytest.raises(RipGrepError, match='regex parse error'):
+        out.as_dict
+
+def test_pipe_to_source_like_run():
+    source = Ripgrepy('l+ol', 'tests').glob('*.lol').two_pass('lol')
+    out = source.pipe_to(Ripgrepy('lolol', '-')).run()
+    assert out.as_string == 'tests/test.lol:lolol\n'
+    assert source.command[1:] == ['--glob', '*.lol']
+    out = Ripgrepy('', 'tests').pipe_to(Ripgrepy('lol', '-')).run()
+    assert out._process is None
+    assert out.as_string == ''
+
+def test_resolve_rg(tmp_path, monkeypatch):
+    rg = Ripgrepy('lol', 'tests').command[0]
+    for name in ('a', 'b'):
+        (tmp_path / name / 'bin').mkdir(parents=True)
+        (tmp_path / name / 'bin' / 'rg').symlink_to(rg)
+    monkeypatch.chdir(tmp_path / 'a')
+    assert Ripgrepy('lol', '.', rg_path='./bin/rg').command[0] == str(tmp_path / 'a' / 'bin' / 'rg')
+    monkeypatch.chdir(tmp_path / 'b')
+    assert Ripgrepy('lol', '.', rg_path='./bin/rg').command[0] == str(tmp_path / 'b' / 'bin' / 'rg')
+    monkeypatch.setenv('PATH', str(tmp_path / 'c'))
+    with pytest.raises(ripgrepy.RipGrepNotFound):
+        Ripgrepy('lol', '.')
+    (tmp_path / 'c').mkdir()
+    (tmp_path / 'c' / 'rg').symlink_to(rg)
+    assert Ripgrepy('lol', '.').command[0] == str(tmp_path / 'c' / 'rg')
+
+def test_as_json_compact():
+    out = Ripgrepy('lol', 'tests/lol').json().run()
+    assert out.as_json == json.dumps(out.as_dict, separators=(',', ':'), ensure_ascii=False)
+    # the same string without orjson
+    code = ("import sys; sys.modules['orjson'] = None; from ripgrepy import Ripgrepy; "
+            "print(Ripgrepy('lol', 'tests/lol').json().run().as_json, end='')")
+    fallback = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+    assert fallback.stdout == out.as_json